@@ -162,7 +162,7 @@ class ProjectAnalyzer:
 
         # Start fresh
         self.profile = SecurityProfile()
-        self.profile.base_commands = BASE_COMMANDS.copy()
+        self.profile.base_commands = set(BASE_COMMANDS)
         self.profile.project_dir = str(self.project_dir)
 
         # Run detection
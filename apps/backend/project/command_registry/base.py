@@ -12,6 +12,14 @@ Security Modes:
 """
 
 import os
+from collections.abc import Mapping
+from types import MappingProxyType
+
+# SECURITY_STRICT_MODE values (compared lowercased) that enable strict mode
+_STRICT_TRUTHY = frozenset({"true", "1", "yes"})
+
+# Last seen SECURITY_STRICT_MODE value and the flag derived from it
+_strict_mode_cache: tuple[str | None, bool] | None = None
 
 
 def is_strict_mode() -> bool:
@@ -24,15 +32,34 @@ def is_strict_mode() -> bool:
     - Provides defense against prompt injection attacks
 
     Enable with: SECURITY_STRICT_MODE=true
+
+    The parsed flag is cached against the raw env value, so the common
+    path is one env lookup and a comparison; changes to the variable are
+    still picked up.
     """
-    return os.environ.get("SECURITY_STRICT_MODE", "").lower() in ("true", "1", "yes")
+    global _strict_mode_cache
+
+    raw = os.environ.get("SECURITY_STRICT_MODE")
+    cached = _strict_mode_cache
+    if cached is not None and cached[0] == raw:
+        return cached[1]
+
+    strict = raw is not None and raw.lower() in _STRICT_TRUTHY
+    _strict_mode_cache = (raw, strict)
+    return strict
+
+
+def _reset_strict_mode_cache() -> None:
+    """Forget the cached strict mode flag so the env var is re-parsed."""
+    global _strict_mode_cache
+    _strict_mode_cache = None
 
 
 # =============================================================================
 # SAFE COMMANDS - Always safe regardless of project type or mode
 # =============================================================================
 
-SAFE_COMMANDS: set[str] = {
+SAFE_COMMANDS: frozenset[str] = frozenset({
     # Core shell (read/navigate)
     "echo",
     "printf",
@@ -160,7 +187,7 @@ SAFE_COMMANDS: set[str] = {
     "yes",
     "jq",
     "yq",
-}
+})
 
 # =============================================================================
 # DANGEROUS COMMANDS - Disabled in strict mode
@@ -170,47 +197,59 @@ SAFE_COMMANDS: set[str] = {
 # - Spawn new shells that bypass security hooks (sh, bash, zsh)
 # - Exfiltrate data to external servers (curl, wget with POST)
 
-DANGEROUS_COMMANDS: set[str] = {
+DANGEROUS_COMMANDS: frozenset[str] = frozenset({
     "eval",   # Can execute arbitrary shell code
     "exec",   # Can replace current process with arbitrary command
     "sh",     # Spawns new shell - bypasses command validation
     "bash",   # Spawns new shell - bypasses command validation
     "zsh",    # Spawns new shell - bypasses command validation
-}
+})
 
 # Network commands - allowed but validated in strict mode
-NETWORK_COMMANDS: set[str] = {
+NETWORK_COMMANDS: frozenset[str] = frozenset({
     "curl",   # Can exfiltrate data via POST/PUT
     "wget",   # Can exfiltrate data via POST
-}
+})
 
 # =============================================================================
 # BASE_COMMANDS - Computed based on security mode
 # =============================================================================
 
 
-def get_base_commands() -> set[str]:
+# Precomputed per-mode command sets (immutable, shared between calls)
+_BASE_COMMANDS_NORMAL: frozenset[str] = (
+    SAFE_COMMANDS | DANGEROUS_COMMANDS | NETWORK_COMMANDS
+)
+_BASE_COMMANDS_STRICT: frozenset[str] = SAFE_COMMANDS | NETWORK_COMMANDS
+
+
+def get_base_commands() -> frozenset[str]:
     """
     Get the base command set based on current security mode.
 
     In strict mode, dangerous commands are excluded and network
     commands require validation.
+
+    The returned set is immutable and shared between calls.
     """
     if is_strict_mode():
         # Strict mode: safe commands + network commands (validated separately)
-        return SAFE_COMMANDS | NETWORK_COMMANDS
-    else:
-        # Normal mode: all commands (backward compatible)
-        return SAFE_COMMANDS | DANGEROUS_COMMANDS | NETWORK_COMMANDS
+        return _BASE_COMMANDS_STRICT
+    # Normal mode: all commands (backward compatible)
+    return _BASE_COMMANDS_NORMAL
 
 
 # For backward compatibility, BASE_COMMANDS is the full set
 # Code should use get_base_commands() for mode-aware behavior
-BASE_COMMANDS: set[str] = SAFE_COMMANDS | DANGEROUS_COMMANDS | NETWORK_COMMANDS
+BASE_COMMANDS: frozenset[str] = _BASE_COMMANDS_NORMAL
 
 # =============================================================================
 # VALIDATED COMMANDS - Need extra validation even when allowed
 # =============================================================================
+# These tables only name the validator for each command (see
+# needs_validation()). Runtime dispatch goes through the function-keyed
+# tables in security.validator_registry, which cannot be imported here
+# without an import cycle.
 
 # Base validators (always active)
 _BASE_VALIDATORS: dict[str, str] = {
@@ -228,17 +267,29 @@ _STRICT_VALIDATORS: dict[str, str] = {
 }
 
 
-def get_validated_commands() -> dict[str, str]:
+# Mode tables precomputed once, as read-only views so callers cannot
+# change the shared tables
+_VALIDATED_COMMANDS_BASE: Mapping[str, str] = MappingProxyType(_BASE_VALIDATORS)
+_VALIDATED_COMMANDS_STRICT: Mapping[str, str] = MappingProxyType(
+    {
+        **_BASE_VALIDATORS,
+        **_STRICT_VALIDATORS,
+    }
+)
+
+
+def get_validated_commands() -> Mapping[str, str]:
     """
     Get the validated commands dict based on current security mode.
 
     In strict mode, curl and wget require validation to prevent
     data exfiltration.
+
+    The returned mapping is read-only and shared between calls.
     """
     if is_strict_mode():
-        return {**_BASE_VALIDATORS, **_STRICT_VALIDATORS}
-    else:
-        return _BASE_VALIDATORS.copy()
+        return _VALIDATED_COMMANDS_STRICT
+    return _VALIDATED_COMMANDS_BASE
 
 
 # For backward compatibility
@@ -4,19 +4,53 @@ GitLab API Client
 
 Client for GitLab API operations.
 Uses direct API calls with PRIVATE-TOKEN authentication.
+
+Connections are kept alive and reused between calls (one per thread),
+so a sequence of API calls against the same instance pays for the
+TCP/TLS handshake only once.
 """
 
 from __future__ import annotations
 
+import functools
+import http.client
 import json
+import select
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+
+# Transient responses retried by _fetch_response (rate limits, gateway errors)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Methods safe to repeat after a 5xx. Writes (POST, and PUT such as the
+# non-idempotent /merge) are only retried on 429, where GitLab has
+# rejected the request without processing it
+RETRY_METHODS = frozenset({"GET"})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3  # seconds, doubled after each attempt
+MAX_RETRY_AFTER = 60.0  # cap on a server-provided Retry-After delay
 
-@dataclass
+# Redirects followed by _fetch_response (the connection does not follow them)
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 5
+
+
+@dataclass(frozen=True, slots=True)
 class GitLabConfig:
     """GitLab configuration loaded from project."""
 
@@ -25,11 +59,117 @@ class GitLabConfig:
     instance_url: str
 
 
+def _json_dumps(data: Any) -> bytes:
+    """Serialize a request body to JSON bytes (orjson when available)."""
+    if _HAS_ORJSON:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _json_loads(body: bytes) -> Any:
+    """Parse a JSON response body (orjson when available)."""
+    if _HAS_ORJSON:
+        return orjson.loads(body)
+    return json.loads(body.decode("utf-8"))
+
+
 def encode_project_path(project: str) -> str:
     """URL-encode a project path for API calls."""
     return urllib.parse.quote(project, safe="")
 
 
+def _should_retry(method: str, status: int) -> bool:
+    """Check if a response status is worth retrying for this method."""
+    if status not in RETRY_STATUSES:
+        return False
+    return method in RETRY_METHODS or status == 429
+
+
+def _retry_delay(attempt: int, headers: http.client.HTTPMessage) -> float:
+    """Seconds to wait before the next retry, honouring Retry-After."""
+    retry_after = headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_RETRY_AFTER)
+    return RETRY_BACKOFF * (2**attempt)
+
+
+def _redirect_url(
+    url: str, method: str, status: int, headers: http.client.HTTPMessage
+) -> str | None:
+    """
+    Get the target of a redirect that is safe to follow with our headers.
+
+    Only redirects on the same host are followed, and a scheme change is
+    only allowed from http to https, so the token never leaves the
+    instance or drops out of TLS. Other methods than GET are only
+    redirected by 307/308, which preserve the method and body.
+
+    Returns:
+        Absolute redirect URL, or None if it must not be followed
+    """
+    location = headers.get("Location")
+    if not location or (method != "GET" and status not in (307, 308)):
+        return None
+
+    target = urllib.parse.urljoin(url, location)
+    source_parts = urllib.parse.urlsplit(url)
+    target_parts = urllib.parse.urlsplit(target)
+    if target_parts.hostname != source_parts.hostname:
+        return None
+    if target_parts.scheme != source_parts.scheme and (
+        (source_parts.scheme, target_parts.scheme) != ("http", "https")
+    ):
+        return None
+    return target
+
+
+def _connection_dropped(conn: http.client.HTTPConnection) -> bool:
+    """
+    Check whether the server has closed an idle kept-alive connection.
+
+    An idle connection has nothing to read, so a readable socket means
+    the server sent EOF (or stray data) and the connection must not be
+    reused.
+    """
+    if conn.sock is None:
+        return False
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(conn.sock, select.POLLIN)
+        return bool(poller.poll(0))
+    readable, _, _ = select.select([conn.sock], [], [], 0)
+    return bool(readable)
+
+
+def _next_page_url(url: str, headers: http.client.HTTPMessage) -> str | None:
+    """
+    Get the URL of the next page from GitLab pagination headers.
+
+    Prefers the Link rel="next" header (keyset and offset pagination),
+    falling back to x-next-page for offset pagination. Only the query is
+    taken from the response: the next page is always requested from the
+    same scheme, host and path as this one, so a Link header can never
+    send the token to another host.
+
+    Returns:
+        Next page URL, or None on the last page
+    """
+    parts = urllib.parse.urlsplit(url)
+    for link in (headers.get("Link") or "").split(","):
+        target, _, rel = link.partition(";")
+        if 'rel="next"' in rel:
+            target_query = urllib.parse.urlsplit(target.strip().strip("<>")).query
+            return parts._replace(query=target_query).geturl()
+
+    next_page = headers.get("x-next-page")
+    if not next_page:
+        return None
+
+    query = dict(urllib.parse.parse_qsl(parts.query))
+    query["page"] = next_page
+    return parts._replace(query=urllib.parse.urlencode(query)).geturl()
+
+
 class GitLabClient:
     """Client for GitLab API operations."""
 
@@ -42,6 +182,16 @@ class GitLabClient:
         self.project_dir = Path(project_dir)
         self.config = config
         self.default_timeout = default_timeout
+        # Endpoint prefixes are fixed per client, so encode the project once
+        self._encoded_project = encode_project_path(config.project)
+        self._mr_base = f"/projects/{self._encoded_project}/merge_requests"
+        # Request headers are the same for every call
+        self._headers = {
+            "PRIVATE-TOKEN": config.token,
+            "Content-Type": "application/json",
+        }
+        # Per-thread persistent connection to the GitLab instance
+        self._local = threading.local()
 
     def _api_url(self, endpoint: str) -> str:
         """Build full API URL."""
@@ -50,6 +200,141 @@ class GitLabClient:
             endpoint = f"/{endpoint}"
         return f"{base}/api/v4{endpoint}"
 
+    def _connection(
+        self, parts: urllib.parse.SplitResult, timeout: float
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """
+        Get this thread's persistent connection, creating it if needed.
+
+        Returns:
+            Tuple of (connection, reused) where reused is True if the
+            connection was opened by an earlier request
+        """
+        key = (parts.scheme, parts.netloc)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            if self._local.key == key and not _connection_dropped(conn):
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                return conn, True
+            self._drop_connection()
+
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(parts.netloc, timeout=timeout)
+        self._local.conn = conn
+        self._local.key = key
+        return conn, False
+
+    def _drop_connection(self) -> None:
+        """Close and forget this thread's persistent connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """
+        Send a request over the persistent connection.
+
+        Falls back to urllib (one connection per request) when a proxy is
+        configured, since http.client does not read proxy settings.
+
+        Returns:
+            Tuple of (status, headers, body)
+        """
+        parts = urllib.parse.urlsplit(url)
+
+        if parts.scheme in urllib.request.getproxies() and not (
+            urllib.request.proxy_bypass(parts.hostname or "")
+        ):
+            req = urllib.request.Request(url, data=body, headers=headers, method=method)
+            try:
+                with urllib.request.urlopen(req, timeout=timeout) as response:
+                    return response.status, response.headers, response.read()
+            except urllib.error.HTTPError as e:
+                return e.code, e.headers, e.read() if e.fp else b""
+
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        while True:
+            conn, reused = self._connection(parts, timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.headers, response.read()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                self._drop_connection()
+                # The server may close an idle kept-alive connection before
+                # reading our request; retry once on a fresh connection. It
+                # may also have processed the request before dropping, so
+                # writes are never resent.
+                if not reused or method not in RETRY_METHODS:
+                    raise
+            except Exception:
+                self._drop_connection()
+                raise
+
+    def _fetch_response(
+        self,
+        url: str,
+        method: str = "GET",
+        data: dict | None = None,
+        timeout: float | None = None,
+    ) -> tuple[Any, http.client.HTTPMessage]:
+        """
+        Make an API request to a full GitLab URL.
+
+        Transient failures (RETRY_STATUSES) are retried with exponential
+        backoff over the same kept-alive connection. Same-host redirects
+        are followed; any other non-2xx response raises.
+
+        Returns:
+            Tuple of (decoded JSON body or None, response headers)
+        """
+        request_data = None
+        if data:
+            request_data = _json_dumps(data)
+
+        attempt = 0
+        redirects = 0
+        while True:
+            status, response_headers, body = self._request(
+                method,
+                url,
+                request_data,
+                self._headers,
+                timeout or self.default_timeout,
+            )
+            if status in REDIRECT_STATUSES and redirects < MAX_REDIRECTS:
+                target = _redirect_url(url, method, status, response_headers)
+                if target is not None:
+                    url = target
+                    redirects += 1
+                    continue
+            if attempt == MAX_RETRIES or not _should_retry(method, status):
+                break
+            time.sleep(_retry_delay(attempt, response_headers))
+            attempt += 1
+
+        if not 200 <= status < 300:
+            error_body = body.decode("utf-8", errors="replace")
+            raise Exception(f"GitLab API error {status}: {error_body}")
+        if status == 204:
+            return None, response_headers
+        return _json_loads(body), response_headers
+
     def _fetch(
         self,
         endpoint: str,
@@ -58,62 +343,85 @@ class GitLabClient:
         timeout: float | None = None,
     ) -> Any:
         """Make an API request to GitLab."""
-        url = self._api_url(endpoint)
-        headers = {
-            "PRIVATE-TOKEN": self.config.token,
-            "Content-Type": "application/json",
-        }
+        result, _ = self._fetch_response(
+            self._api_url(endpoint), method=method, data=data, timeout=timeout
+        )
+        return result
 
-        request_data = None
-        if data:
-            request_data = json.dumps(data).encode("utf-8")
+    def _paginate(self, endpoint: str, **params: Any) -> Iterator[dict]:
+        """
+        Lazily yield every item of a list endpoint, page by page.
 
-        req = urllib.request.Request(
-            url,
-            data=request_data,
-            headers=headers,
-            method=method,
-        )
+        Pages are followed via the Link or x-next-page header rather than
+        x-total-pages, which GitLab omits for large result sets.
 
+        Args:
+            endpoint: API endpoint of the collection
+            **params: Extra query parameters
+
+        Yields:
+            Items from each page in order
+        """
+        query: dict[str, Any] = {"per_page": 100, **params}
+
+        url: str | None = f"{self._api_url(endpoint)}?{urllib.parse.urlencode(query)}"
+        while url:
+            items, headers = self._fetch_response(url)
+            yield from items or ()
+            url = _next_page_url(url, headers)
+
+    def _call_in_worker(self, func: Callable[[int], Any], mr_iid: int) -> Any:
+        """Run an API call on a pool thread, closing its connection after."""
         try:
-            with urllib.request.urlopen(
-                req, timeout=timeout or self.default_timeout
-            ) as response:
-                if response.status == 204:
-                    return None
-                return json.loads(response.read().decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            raise Exception(f"GitLab API error {e.code}: {error_body}") from e
+            return func(mr_iid)
+        finally:
+            self._drop_connection()
+
+    def close(self) -> None:
+        """Close the calling thread's persistent connection."""
+        self._drop_connection()
 
     def get_mr(self, mr_iid: int) -> dict:
         """Get MR details."""
-        encoded_project = encode_project_path(self.config.project)
-        return self._fetch(f"/projects/{encoded_project}/merge_requests/{mr_iid}")
+        return self._fetch(f"{self._mr_base}/{mr_iid}")
 
     def get_mr_changes(self, mr_iid: int) -> dict:
         """Get MR changes (diff)."""
-        encoded_project = encode_project_path(self.config.project)
-        return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}/changes"
-        )
+        return self._fetch(f"{self._mr_base}/{mr_iid}/changes")
 
-    def get_mr_diff(self, mr_iid: int) -> str:
-        """Get the full diff for an MR."""
+    def iter_mr_diff(self, mr_iid: int) -> Iterator[str]:
+        """Yield the non-empty per-file diffs of an MR."""
         changes = self.get_mr_changes(mr_iid)
-        diffs = []
         for change in changes.get("changes", []):
             diff = change.get("diff", "")
             if diff:
-                diffs.append(diff)
-        return "\n".join(diffs)
+                yield diff
+
+    def get_mr_diff(self, mr_iid: int) -> str:
+        """Get the full diff for an MR."""
+        return "\n".join(self.iter_mr_diff(mr_iid))
 
     def get_mr_commits(self, mr_iid: int) -> list[dict]:
-        """Get commits for an MR."""
-        encoded_project = encode_project_path(self.config.project)
-        return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}/commits"
-        )
+        """Get commits for an MR (all pages)."""
+        return list(self._paginate(f"{self._mr_base}/{mr_iid}/commits"))
+
+    def fetch_mr_bundle(self, mr_iid: int) -> tuple[dict, dict, list[dict]]:
+        """
+        Fetch MR details, changes and commits concurrently.
+
+        The three endpoints are independent, so issuing them in parallel
+        costs roughly one round-trip instead of three.
+
+        Returns:
+            Tuple of (mr, changes, commits)
+        """
+        with ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="gitlab-api"
+        ) as executor:
+            mr = executor.submit(self._call_in_worker, self.get_mr, mr_iid)
+            changes = executor.submit(self._call_in_worker, self.get_mr_changes, mr_iid)
+            commits = executor.submit(self._call_in_worker, self.get_mr_commits, mr_iid)
+            return mr.result(), changes.result(), commits.result()
 
     def get_current_user(self) -> dict:
         """Get current authenticated user."""
@@ -121,50 +429,58 @@ class GitLabClient:
 
     def post_mr_note(self, mr_iid: int, body: str) -> dict:
         """Post a note (comment) to an MR."""
-        encoded_project = encode_project_path(self.config.project)
         return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}/notes",
+            f"{self._mr_base}/{mr_iid}/notes",
             method="POST",
             data={"body": body},
         )
 
     def approve_mr(self, mr_iid: int) -> dict:
         """Approve an MR."""
-        encoded_project = encode_project_path(self.config.project)
         return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}/approve",
+            f"{self._mr_base}/{mr_iid}/approve",
             method="POST",
         )
 
     def merge_mr(self, mr_iid: int, squash: bool = False) -> dict:
         """Merge an MR."""
-        encoded_project = encode_project_path(self.config.project)
-        data = {}
-        if squash:
-            data["squash"] = True
         return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}/merge",
+            f"{self._mr_base}/{mr_iid}/merge",
             method="PUT",
-            data=data if data else None,
+            data={"squash": True} if squash else None,
         )
 
     def assign_mr(self, mr_iid: int, user_ids: list[int]) -> dict:
         """Assign users to an MR."""
-        encoded_project = encode_project_path(self.config.project)
         return self._fetch(
-            f"/projects/{encoded_project}/merge_requests/{mr_iid}",
+            f"{self._mr_base}/{mr_iid}",
             method="PUT",
             data={"assignee_ids": user_ids},
         )
 
 
 def load_gitlab_config(project_dir: Path) -> GitLabConfig | None:
-    """Load GitLab config from project's .auto-claude/gitlab/config.json."""
-    config_path = project_dir / ".auto-claude" / "gitlab" / "config.json"
+    """
+    Load GitLab config from project's .auto-claude/gitlab/config.json.
+
+    Parsed configs are cached per file and modification time, so repeated
+    calls (e.g. one per client) cost a single stat() once loaded.
+    """
+    config_path = (
+        Path(project_dir).resolve() / ".auto-claude" / "gitlab" / "config.json"
+    )
 
-    if not config_path.exists():
+    try:
+        mtime_ns = config_path.stat().st_mtime_ns
+    except OSError:
         return None
 
+    return _load_gitlab_config_cached(str(config_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_gitlab_config_cached(config_path: str, mtime_ns: int) -> GitLabConfig | None:
+    """Parse a GitLab config file (cached by path and mtime)."""
     try:
         with open(config_path) as f:
             data = json.load(f)
@@ -183,3 +499,8 @@ def load_gitlab_config(project_dir: Path) -> GitLabConfig | None:
         )
     except Exception:
         return None
+
+
+def _reset_gitlab_config_cache() -> None:
+    """Forget cached GitLab configs so files are re-read (tests)."""
+    _load_gitlab_config_cached.cache_clear()
@@ -9,6 +9,7 @@ Main coordinator for GitLab automation workflows:
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -119,14 +120,11 @@ class GitLabOrchestrator:
         """Gather context for an MR."""
         print(f"[GitLab] Fetching MR !{mr_iid} data...", flush=True)
 
-        # Get MR details
-        mr_data = self.client.get_mr(mr_iid)
-
-        # Get changes
-        changes_data = self.client.get_mr_changes(mr_iid)
-
-        # Get commits
-        commits = self.client.get_mr_commits(mr_iid)
+        # Get MR details, changes and commits (fetched concurrently). The
+        # client blocks, including its retry backoff, so keep it off the loop
+        mr_data, changes_data, commits = await asyncio.get_event_loop().run_in_executor(
+            None, self.client.fetch_mr_bundle, mr_iid
+        )
 
         # Build diff from changes
         diffs = []
@@ -26,48 +26,9 @@ Validators:
 - All validators are available via the VALIDATORS dict
 """
 
-# Core hooks
-# Re-export from project_analyzer for convenience
-from project_analyzer import (
-    BASE_COMMANDS,
-    SecurityProfile,
-    is_command_allowed,
-    needs_validation,
-)
-
-from .hooks import bash_security_hook, validate_command
-
-# Command parsing utilities
-from .parser import (
-    extract_commands,
-    get_command_for_validation,
-    split_command_segments,
-)
-
-# Profile management
-from .profile import (
-    get_security_profile,
-    reset_profile_cache,
-)
-
-# Validators (for advanced usage)
-from .validator import (
-    VALIDATORS,
-    validate_chmod_command,
-    validate_dropdb_command,
-    validate_dropuser_command,
-    validate_git_commit,
-    validate_init_script,
-    validate_kill_command,
-    validate_killall_command,
-    validate_mongosh_command,
-    validate_mysql_command,
-    validate_mysqladmin_command,
-    validate_pkill_command,
-    validate_psql_command,
-    validate_redis_cli_command,
-    validate_rm_command,
-)
+# Note: Exports are resolved lazily (PEP 562) so that importing a single
+# submodule such as security.network_validators does not pull in the
+# hooks, profile and project_analyzer stacks.
 
 __all__ = [
     # Main API
@@ -101,3 +62,58 @@ __all__ = [
     "needs_validation",
     "BASE_COMMANDS",
 ]
+
+
+def __getattr__(name):
+    """Lazy imports to avoid loading the whole security stack up front."""
+    if name in ("bash_security_hook", "validate_command"):
+        from .hooks import bash_security_hook, validate_command
+
+        return locals()[name]
+    elif name in (
+        "extract_commands",
+        "get_command_for_validation",
+        "split_command_segments",
+    ):
+        from .parser import (
+            extract_commands,
+            get_command_for_validation,
+            split_command_segments,
+        )
+
+        return locals()[name]
+    elif name in ("get_security_profile", "reset_profile_cache"):
+        from .profile import get_security_profile, reset_profile_cache
+
+        return locals()[name]
+    elif name in (
+        "VALIDATORS",
+        "validate_chmod_command",
+        "validate_dropdb_command",
+        "validate_dropuser_command",
+        "validate_git_commit",
+        "validate_init_script",
+        "validate_kill_command",
+        "validate_killall_command",
+        "validate_mongosh_command",
+        "validate_mysql_command",
+        "validate_mysqladmin_command",
+        "validate_pkill_command",
+        "validate_psql_command",
+        "validate_redis_cli_command",
+        "validate_rm_command",
+    ):
+        from . import validator as _validator
+
+        return getattr(_validator, name)
+    elif name in (
+        "BASE_COMMANDS",
+        "SecurityProfile",
+        "is_command_allowed",
+        "needs_validation",
+    ):
+        # Re-exported from project_analyzer for convenience
+        import project_analyzer
+
+        return getattr(project_analyzer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,8 +11,10 @@ These validators prevent data exfiltration by:
 4. Blocking file upload patterns
 """
 
+import functools
 import re
 import shlex
+from dataclasses import dataclass
 from urllib.parse import urlparse
 
 from .validation_models import ValidationResult
@@ -25,6 +27,23 @@ ALLOWED_HOSTS = {
     "0.0.0.0",
 }
 
+# URL scheme prefixes recognised as a request target
+_URL_SCHEMES = ("http://", "https://", "ftp://")
+
+# A URL that is exactly scheme://<allowed host>[:port] followed by a path,
+# query, fragment or the end of the string. No userinfo can sit in between,
+# so a match needs no further parsing.
+_LOCALHOST_URL_RE = re.compile(
+    "(?:"
+    + "|".join(re.escape(scheme) for scheme in _URL_SCHEMES)
+    + ")(?:"
+    + "|".join(
+        re.escape(f"[{host}]" if ":" in host else host) for host in sorted(ALLOWED_HOSTS)
+    )
+    + r")(?::[0-9]*)?(?:[/?#]|\Z)",
+    re.IGNORECASE,
+)
+
 # curl flags that indicate data upload (potential exfiltration)
 CURL_UPLOAD_FLAGS = {
     "-d", "--data",
@@ -34,163 +53,373 @@ CURL_UPLOAD_FLAGS = {
     "--json",
 }
 
+# HTTP methods that send data to or modify state on the server
+_UPLOAD_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
 # curl flags that change method to upload
 CURL_METHOD_FLAGS = {
-    "-X": {"POST", "PUT", "PATCH"},
-    "--request": {"POST", "PUT", "PATCH"},
+    "-X": _UPLOAD_METHODS,
+    "--request": _UPLOAD_METHODS,
 }
 
 # wget flags that indicate upload (rare but possible)
 WGET_UPLOAD_FLAGS = {
     "--post-data", "--post-file",
     "--body-data", "--body-file",
-    "--method",  # When used with POST/PUT
 }
 
+# Single-letter curl options that can make a request an upload
+_CURL_SHORT_UPLOAD_LETTERS = "".join(
+    sorted(flag[1] for flag in CURL_UPLOAD_FLAGS | CURL_METHOD_FLAGS.keys() if len(flag) == 2)
+)
+
+# Any curl flag that can make a request an upload: a long flag as a whole
+# token or "--flag=value", or a short option cluster containing one of the
+# upload letters ("-d", "-sXPOST"). Only meaningful on strings that need no
+# shlex unquoting.
+_CURL_UPLOAD_RE = re.compile(
+    r"(?:^|\s)(?:(?:"
+    + "|".join(
+        re.escape(flag)
+        for flag in sorted(CURL_UPLOAD_FLAGS | CURL_METHOD_FLAGS.keys())
+        if flag.startswith("--")
+    )
+    + r")(?:[=\s]|$)|-[^\s-]*?["
+    + _CURL_SHORT_UPLOAD_LETTERS
+    + "])"
+)
+
+# Any wget option that can make a request an upload: an upload flag or
+# --execute, as a whole token or "--flag=value", or a short option cluster
+# containing -e. Only meaningful on strings that need no shlex unquoting.
+_WGET_UPLOAD_RE = re.compile(
+    r"(?:^|\s)(?:(?:"
+    + "|".join(re.escape(flag) for flag in sorted(WGET_UPLOAD_FLAGS | {"--method", "--execute"}))
+    + r")(?:[=\s]|$)|-[^\s-]*?e)"
+)
+
+# curl flags that take an argument (their value must be skipped)
+_CURL_SKIP_FLAGS = frozenset(
+    {
+        "-o", "--output",
+        "-H", "--header",
+        "-A", "--user-agent",
+        "-e", "--referer",
+        "-u", "--user",
+        "-x", "--proxy",
+        "-b", "--cookie",
+        "-c", "--cookie-jar",
+        "--connect-timeout", "-m", "--max-time",
+        "-w", "--write-out",
+        "--retry", "--retry-delay", "--retry-max-time",
+        "--cacert", "--capath",
+        "-E", "--cert", "--cert-type", "--key", "--key-type",
+        "-r", "--range",
+        "-C", "--continue-at",
+        "-z", "--time-cond",
+        "-y", "--speed-time",
+        "-Y", "--speed-limit",
+        "--limit-rate",
+    }
+    | CURL_UPLOAD_FLAGS
+)
+
+# Single-letter curl options that take an argument; in a cluster such as
+# "-sXPOST" the rest of the token after one of these is its value
+_CURL_SHORT_ARG_LETTERS = frozenset(
+    flag[1]
+    for flag in _CURL_SKIP_FLAGS | CURL_METHOD_FLAGS.keys()
+    if len(flag) == 2
+)
+
+# wget flags that take an argument (their value must be skipped)
+_WGET_SKIP_FLAGS = frozenset(
+    {
+        "-O", "--output-document",
+        "-o", "--output-file",
+        "-a", "--append-output",
+        "--header",
+        "--user-agent", "-U",
+        "--referer",
+        "--user", "--password",
+        "--proxy-user", "--proxy-password",
+        "-e", "--execute",
+        "--method",
+        "-t", "--tries",
+        "-T", "--timeout",
+        "--dns-timeout", "--connect-timeout", "--read-timeout",
+        "-w", "--wait",
+        "--limit-rate",
+        "-P", "--directory-prefix",
+        "-l", "--level",
+        "-Q", "--quota",
+        "--ca-certificate", "--ca-directory",
+        "--certificate", "--private-key",
+    }
+    | WGET_UPLOAD_FLAGS
+)
+
+# Single-letter wget options that take an argument
+_WGET_SHORT_ARG_LETTERS = frozenset(flag[1] for flag in _WGET_SKIP_FLAGS if len(flag) == 2)
+
+# wgetrc commands ("-e post_data=...") equivalent to the upload flags,
+# normalised the way wget compares them: lowercase, no "_" or "-"
+_WGETRC_UPLOAD_COMMANDS = frozenset({"postdata", "postfile", "bodydata", "bodyfile"})
+
 
-def _extract_url_from_tokens(tokens: list[str], skip_flags: set[str]) -> str | None:
+# Characters that make shlex.split() differ from str.split(): quotes, the
+# escape character, and whitespace other than shlex's " \t\r\n"
+_NEEDS_SHLEX_RE = re.compile(
+    r"[\"'\\\x0b\x0c\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
+)
+
+
+def _positional_url(token: str) -> str:
     """
-    Extract the URL from command tokens.
+    Interpret a positional argument as a request URL.
 
-    Args:
-        tokens: Parsed command tokens
-        skip_flags: Flags that take an argument (skip next token)
+    curl and wget request every positional argument, so any token without
+    a scheme is a bare host (optionally with a port and path), including
+    dotless intranet names.
 
     Returns:
-        URL string or None if not found
+        The URL (bare hosts get an http:// scheme)
     """
-    skip_next = False
-    for token in tokens[1:]:  # Skip command name
-        if skip_next:
-            skip_next = False
-            continue
+    if token.lower().startswith(_URL_SCHEMES):
+        return token
+    return f"http://{token}"
 
-        # Check if this is a flag that takes an argument
-        if token.startswith("-"):
-            # Check for flags that take an argument
-            for flag in skip_flags:
-                if token == flag or token.startswith(f"{flag}="):
-                    if "=" not in token:
-                        skip_next = True
-                    break
-            continue
 
-        # This looks like a URL
-        if token.startswith(("http://", "https://", "ftp://")):
-            return token
-        # Bare hostname (curl allows this)
-        elif "." in token or token in ALLOWED_HOSTS:
-            return f"http://{token}"
+def _fast_tokens(command_string: str) -> list[str] | None:
+    """
+    Split a plain command string without running the shlex state machine.
 
-    return None
+    Returns:
+        The tokens, or None if the string needs shlex (quoting/escapes)
+    """
+    if _NEEDS_SHLEX_RE.search(command_string):
+        return None
+    return command_string.split()
 
 
+@functools.lru_cache(maxsize=256)
 def _is_localhost(url: str) -> bool:
     """Check if URL points to localhost."""
-    try:
-        parsed = urlparse(url)
-        hostname = parsed.hostname or ""
-        return hostname.lower() in ALLOWED_HOSTS
-    except Exception:
-        return False
+    if _LOCALHOST_URL_RE.match(url):
+        return True
 
+    netloc = url.partition("://")[2]
+    for sep in "/?#":
+        netloc = netloc.partition(sep)[0]
+    host = netloc.rpartition("@")[2]
 
-def validate_curl_command(command_string: str) -> ValidationResult:
+    # Bracketed IPv6 and URLs with embedded whitespace need the full parser
+    if "[" in netloc or "]" in netloc or any(c in url for c in "\t\r\n"):
+        try:
+            parsed = urlparse(url)
+            hostname = parsed.hostname or ""
+            return hostname.lower() in ALLOWED_HOSTS
+        except Exception:
+            return False
+
+    return host.partition(":")[0].lower() in ALLOWED_HOSTS
+
+
+def _split_short_option(
+    token: str, arg_letters: frozenset[str]
+) -> tuple[str, str | None] | None:
     """
-    Validate curl commands to prevent data exfiltration.
+    Resolve a short option cluster the way curl's and wget's parsers read it.
 
-    In strict mode:
-    - GET requests are allowed to any host
-    - POST/PUT/PATCH with data only allowed to localhost
-    - File uploads blocked to external hosts
+    Letters are options until one takes an argument; the rest of the token
+    is then that option's value ("-sXPOST" is "-s -X POST").
+
+    Returns:
+        (flag, attached value or None), or None if no letter takes an argument
+    """
+    for pos in range(1, len(token)):
+        letter = token[pos]
+        if letter in arg_letters:
+            return f"-{letter}", token[pos + 1:] or None
+    return None
+
+
+def _wgetrc_upload(command: str) -> tuple[bool, str | None]:
+    """
+    Interpret a wgetrc command passed with -e/--execute.
+
+    Returns:
+        (sets upload data, method it selects or None)
+    """
+    name, _, value = command.partition("=")
+    name = name.strip().lower().replace("_", "").replace("-", "")
+    if name == "method":
+        return False, value.strip().upper()
+    return name in _WGETRC_UPLOAD_COMMANDS, None
+
+
+@dataclass(frozen=True)
+class _NetworkTool:
+    """Option tables that drive the shared curl/wget token scan."""
+
+    name: str
+    # Flags that send data ("--flag" or "--flag=value")
+    upload_flags: frozenset[str]
+    # Flags whose value is the HTTP method
+    method_flags: frozenset[str]
+    # Flags whose value is a config command that may set data or method
+    execute_flags: frozenset[str]
+    # Flags that take an argument (their value must be skipped)
+    skip_flags: frozenset[str]
+    # Single-letter options that take an argument
+    short_arg_letters: frozenset[str]
+    # Prefilter for plain strings; no match means no upload option
+    upload_re: re.Pattern[str]
+    # How an explicit method is shown in the block message
+    method_label: str
+
+
+_CURL = _NetworkTool(
+    name="curl",
+    upload_flags=frozenset(CURL_UPLOAD_FLAGS),
+    method_flags=frozenset(CURL_METHOD_FLAGS),
+    execute_flags=frozenset(),
+    skip_flags=_CURL_SKIP_FLAGS,
+    short_arg_letters=_CURL_SHORT_ARG_LETTERS,
+    upload_re=_CURL_UPLOAD_RE,
+    method_label="",
+)
+
+_WGET = _NetworkTool(
+    name="wget",
+    upload_flags=frozenset(WGET_UPLOAD_FLAGS),
+    method_flags=frozenset({"--method"}),
+    execute_flags=frozenset({"-e", "--execute"}),
+    skip_flags=_WGET_SKIP_FLAGS,
+    short_arg_letters=_WGET_SHORT_ARG_LETTERS,
+    upload_re=_WGET_UPLOAD_RE,
+    method_label="--method=",
+)
+
+
+def _validate_network_command(command_string: str, tool: _NetworkTool) -> ValidationResult:
+    """
+    Block uploads to external hosts for a curl-like command.
 
     Args:
-        command_string: The full curl command string
+        command_string: The full command string
+        tool: Option tables for the command
 
     Returns:
         Tuple of (is_valid, error_message)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse curl command"
+    tokens = _fast_tokens(command_string)
+    is_plain = tokens is not None
+    if tokens is None:
+        try:
+            tokens = shlex.split(command_string)
+        except ValueError:
+            return False, f"Could not parse {tool.name} command"
+
+    if not tokens or tokens[0] != tool.name:
+        return False, f"Not a {tool.name} command"
+
+    # No "-" anywhere means no token can be an option (the bare
+    # "curl URL" case), so skip the scan entirely
+    if "-" not in command_string:
+        return True, ""
 
-    if not tokens or tokens[0] != "curl":
-        return False, "Not a curl command"
+    # Without quoting, tokens are plain substrings, so a single regex search
+    # proves there is no upload, method or config option to scan for
+    if is_plain and not tool.upload_re.search(command_string):
+        return True, ""
 
     # Track what we find
     has_upload_data = False
     explicit_method = None
     upload_flag_found = None
-
-    # Flags that take arguments (we need to skip their values)
-    skip_flags = {
-        "-o", "--output", "-O",
-        "-H", "--header",
-        "-A", "--user-agent",
-        "-e", "--referer",
-        "-u", "--user",
-        "-x", "--proxy",
-        "-b", "--cookie",
-        "-c", "--cookie-jar",
-        "--connect-timeout", "--max-time",
-        "-w", "--write-out",
-        "--retry", "--retry-delay",
-    }
-    skip_flags.update(CURL_UPLOAD_FLAGS)
+    # curl and wget request every URL given, so all must be localhost
+    has_url = False
+    has_external_url = False
 
     i = 1
     while i < len(tokens):
         token = tokens[i]
 
-        # Check for upload data flags
-        for flag in CURL_UPLOAD_FLAGS:
-            if token == flag:
-                has_upload_data = True
-                upload_flag_found = flag
-                break
-            elif token.startswith(f"{flag}="):
-                has_upload_data = True
-                upload_flag_found = flag
-                break
+        if not token.startswith("-"):
+            has_url = True
+            if not _is_localhost(_positional_url(token)):
+                has_external_url = True
+                # Uploading to an external host: the verdict is settled
+                if has_upload_data:
+                    break
+            i += 1
+            continue
 
-        # Check for explicit method
-        if token in ("-X", "--request"):
-            if i + 1 < len(tokens):
-                explicit_method = tokens[i + 1].upper()
+        # Short option cluster ("-sXPOST", "-qO-"): find the option that
+        # takes an argument and any value attached to it
+        attached = None
+        if len(token) > 2 and token[1] != "-":
+            short_option = _split_short_option(token, tool.short_arg_letters)
+            if short_option is None:
                 i += 1
+                continue
+            token, attached = short_option
+
+        # Check for upload data flags ("--data" or "--data=...")
+        flag_name = token.partition("=")[0]
+        if flag_name in tool.upload_flags:
+            has_upload_data = True
+            upload_flag_found = flag_name
+            if has_external_url:
+                break
+
+        # Explicit method (-X POST, --method=PUT) or config command
+        # (wget -e post_data=...): read the option's value
+        if flag_name in tool.method_flags or flag_name in tool.execute_flags:
+            if attached is None:
+                if "=" in token:
+                    attached = token.partition("=")[2]
+                elif i + 1 < len(tokens):
+                    attached = tokens[i + 1]
+                    i += 1
+            if flag_name in tool.method_flags:
+                if attached is not None:
+                    explicit_method = attached.upper()
+            else:
+                sets_data, method = _wgetrc_upload(attached or "")
+                if sets_data:
+                    has_upload_data = True
+                    upload_flag_found = flag_name
+                    if has_external_url:
+                        break
+                explicit_method = method or explicit_method
 
         # Skip flag arguments
-        if token.startswith("-"):
-            for flag in skip_flags:
-                if token == flag:
-                    i += 1  # Skip next token (the argument)
-                    break
+        elif token in tool.skip_flags and attached is None:
+            i += 1  # Skip next token (the argument)
 
         i += 1
 
-    # Extract URL
-    url = _extract_url_from_tokens(tokens, skip_flags)
-
-    # If localhost, allow everything
-    if url and _is_localhost(url):
+    # If every target is localhost, allow everything
+    if has_url and not has_external_url:
         return True, ""
 
     # Determine if this is an upload operation
-    is_upload = has_upload_data or (explicit_method in {"POST", "PUT", "PATCH"})
+    is_upload = has_upload_data or (explicit_method in _UPLOAD_METHODS)
 
     if is_upload:
         if upload_flag_found:
             return (
                 False,
-                f"curl with '{upload_flag_found}' blocked in strict mode (potential data exfiltration). "
+                f"{tool.name} with '{upload_flag_found}' blocked in strict mode (potential data exfiltration). "
                 f"Only GET requests allowed to external hosts. "
                 f"Localhost requests are unrestricted.",
             )
         else:
             return (
                 False,
-                f"curl {explicit_method} blocked in strict mode (potential data exfiltration). "
+                f"{tool.name} {tool.method_label}{explicit_method} blocked in strict mode (potential data exfiltration). "
                 f"Only GET requests allowed to external hosts. "
                 f"Localhost requests are unrestricted.",
             )
@@ -198,113 +427,36 @@ def validate_curl_command(command_string: str) -> ValidationResult:
     return True, ""
 
 
-def validate_wget_command(command_string: str) -> ValidationResult:
+def validate_curl_command(command_string: str) -> ValidationResult:
     """
-    Validate wget commands to prevent data exfiltration.
+    Validate curl commands to prevent data exfiltration.
 
     In strict mode:
     - GET requests are allowed to any host
-    - POST with data only allowed to localhost
+    - POST/PUT/PATCH/DELETE and data only allowed to localhost
+    - File uploads blocked to external hosts
 
     Args:
-        command_string: The full wget command string
+        command_string: The full curl command string
 
     Returns:
         Tuple of (is_valid, error_message)
     """
-    try:
-        tokens = shlex.split(command_string)
-    except ValueError:
-        return False, "Could not parse wget command"
-
-    if not tokens or tokens[0] != "wget":
-        return False, "Not a wget command"
+    return _validate_network_command(command_string, _CURL)
 
-    # Track what we find
-    has_upload_data = False
-    upload_flag_found = None
-    explicit_method = None
 
-    # Flags that take arguments
-    skip_flags = {
-        "-O", "--output-document",
-        "-o", "--output-file",
-        "-a", "--append-output",
-        "--header",
-        "--user-agent", "-U",
-        "--referer",
-        "--user", "--password",
-        "--proxy-user", "--proxy-password",
-        "-e", "--execute",
-        "-t", "--tries",
-        "-T", "--timeout",
-        "-w", "--wait",
-        "--limit-rate",
-        "-P", "--directory-prefix",
-    }
-    skip_flags.update(WGET_UPLOAD_FLAGS)
-
-    i = 1
-    while i < len(tokens):
-        token = tokens[i]
-
-        # Check for upload data flags
-        for flag in WGET_UPLOAD_FLAGS:
-            if token == flag:
-                has_upload_data = True
-                upload_flag_found = flag
-                break
-            elif token.startswith(f"{flag}="):
-                has_upload_data = True
-                upload_flag_found = flag
-                break
-
-        # Check for explicit method
-        if token == "--method":
-            if i + 1 < len(tokens):
-                explicit_method = tokens[i + 1].upper()
-                i += 1
-        elif token.startswith("--method="):
-            explicit_method = token.split("=", 1)[1].upper()
-
-        # Skip flag arguments
-        if token.startswith("-"):
-            for flag in skip_flags:
-                if token == flag:
-                    i += 1
-                    break
-
-        i += 1
-
-    # Extract URL (wget usually has URL as last argument)
-    url = None
-    for token in reversed(tokens[1:]):
-        if not token.startswith("-"):
-            if token.startswith(("http://", "https://", "ftp://")):
-                url = token
-                break
-
-    # If localhost, allow everything
-    if url and _is_localhost(url):
-        return True, ""
+def validate_wget_command(command_string: str) -> ValidationResult:
+    """
+    Validate wget commands to prevent data exfiltration.
 
-    # Determine if this is an upload operation
-    is_upload = has_upload_data or (explicit_method in {"POST", "PUT", "PATCH"})
+    In strict mode:
+    - GET requests are allowed to any host
+    - POST/PUT/PATCH/DELETE and data only allowed to localhost
 
-    if is_upload:
-        if upload_flag_found:
-            return (
-                False,
-                f"wget with '{upload_flag_found}' blocked in strict mode (potential data exfiltration). "
-                f"Only GET requests allowed to external hosts. "
-                f"Localhost requests are unrestricted.",
-            )
-        else:
-            return (
-                False,
-                f"wget --method={explicit_method} blocked in strict mode (potential data exfiltration). "
-                f"Only GET requests allowed to external hosts. "
-                f"Localhost requests are unrestricted.",
-            )
+    Args:
+        command_string: The full wget command string
 
-    return True, ""
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    return _validate_network_command(command_string, _WGET)
@@ -8,6 +8,9 @@ In strict security mode, additional validators are added for network
 commands (curl, wget) to prevent data exfiltration.
 """
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from project.command_registry.base import is_strict_mode
 
 from .database_validators import (
@@ -74,7 +77,23 @@ _STRICT_VALIDATORS: dict[str, ValidatorFunction] = {
 VALIDATORS: dict[str, ValidatorFunction] = _BASE_VALIDATORS.copy()
 
 
-def get_validators() -> dict[str, ValidatorFunction]:
+# Strict mode table precomputed once (get_validator() reads it directly)
+_VALIDATORS_STRICT: dict[str, ValidatorFunction] = {
+    **_BASE_VALIDATORS,
+    **_STRICT_VALIDATORS,
+}
+
+# Read-only views handed out by get_validators(), so callers cannot
+# change the shared tables
+_BASE_VALIDATORS_VIEW: Mapping[str, ValidatorFunction] = MappingProxyType(
+    _BASE_VALIDATORS
+)
+_VALIDATORS_STRICT_VIEW: Mapping[str, ValidatorFunction] = MappingProxyType(
+    _VALIDATORS_STRICT
+)
+
+
+def get_validators() -> Mapping[str, ValidatorFunction]:
     """
     Get all validators based on current security mode.
 
@@ -82,11 +101,11 @@ def get_validators() -> dict[str, ValidatorFunction]:
     to prevent data exfiltration.
 
     Returns:
-        Dict mapping command names to validator functions
+        Read-only mapping of command names to validator functions
     """
     if is_strict_mode():
-        return {**_BASE_VALIDATORS, **_STRICT_VALIDATORS}
-    return _BASE_VALIDATORS.copy()
+        return _VALIDATORS_STRICT_VIEW
+    return _BASE_VALIDATORS_VIEW
 
 
 def get_validator(command_name: str) -> ValidatorFunction | None:
@@ -102,5 +121,7 @@ def get_validator(command_name: str) -> ValidatorFunction | None:
     Returns:
         The validator function, or None if no validator exists
     """
-    validators = get_validators()
-    return validators.get(command_name)
+    # Called for every command: pick the precomputed table directly
+    # rather than going through get_validators()
+    table = _VALIDATORS_STRICT if is_strict_mode() else _BASE_VALIDATORS
+    return table.get(command_name)
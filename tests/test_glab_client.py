@@ -0,0 +1,446 @@
+"""
+Tests for GitLab API Client
+===========================
+
+Runs the client against a local HTTP server to cover the kept-alive
+transport, error mapping and redirects.
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+backend_path = Path(__file__).parent.parent / "apps" / "backend"
+
+# Import directly to avoid loading the full runners package with its dependencies
+glab_client_spec = importlib.util.spec_from_file_location(
+    "glab_client", backend_path / "runners" / "gitlab" / "glab_client.py"
+)
+glab_client = importlib.util.module_from_spec(glab_client_spec)
+sys.modules["glab_client"] = glab_client
+glab_client_spec.loader.exec_module(glab_client)
+GitLabClient = glab_client.GitLabClient
+GitLabConfig = glab_client.GitLabConfig
+
+MR_BASE = "/api/v4/projects/group%2Fproject/merge_requests"
+PROXY_VARS = (
+    "http_proxy",
+    "HTTP_PROXY",
+    "https_proxy",
+    "HTTPS_PROXY",
+    "all_proxy",
+    "ALL_PROXY",
+    "no_proxy",
+    "NO_PROXY",
+)
+
+
+class _GitLabHandler(BaseHTTPRequestHandler):
+    """Serves canned responses from server.routes, recording each request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        self.server.requests.append(
+            {
+                "method": self.command,
+                "target": self.path,
+                "headers": dict(self.headers),
+                "body": body,
+                "client": self.client_address,
+            }
+        )
+
+        route = self.server.routes.get(
+            urlsplit(self.path).path, (404, {}, {"message": "404 Not Found"})
+        )
+        if isinstance(route, list):
+            route = route.pop(0) if len(route) > 1 else route[0]
+        if callable(route):
+            route = route(self)
+        if route is None:
+            # Drop the connection without answering
+            self.close_connection = True
+            return
+        status, headers, payload = route
+
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = _handle
+
+
+def _start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GitLabHandler)
+    server.daemon_threads = True
+    server.routes = {}
+    server.requests = []
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server
+
+
+def _stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def gitlab_server():
+    server = _start_server()
+    yield server
+    _stop_server(server)
+
+
+@pytest.fixture
+def client(gitlab_server, tmp_path, monkeypatch):
+    for var in PROXY_VARS:
+        monkeypatch.delenv(var, raising=False)
+    config = GitLabConfig(
+        token="secret-token", project="group/project", instance_url=gitlab_server.url
+    )
+    gitlab = GitLabClient(tmp_path, config, default_timeout=5.0)
+    yield gitlab
+    gitlab.close()
+
+
+class TestTransport:
+    """Tests for the kept-alive connection."""
+
+    def test_connection_is_reused(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+
+        assert client.get_mr(1) == {"iid": 1}
+        assert client.get_mr(1) == {"iid": 1}
+
+        clients = {request["client"] for request in gitlab_server.requests}
+        assert len(gitlab_server.requests) == 2
+        assert len(clients) == 1
+
+    def test_sends_token_and_body(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1/notes"] = (201, {}, {"id": 7})
+
+        assert client.post_mr_note(1, "hello") == {"id": 7}
+
+        request = gitlab_server.requests[0]
+        assert request["method"] == "POST"
+        assert request["headers"]["PRIVATE-TOKEN"] == "secret-token"
+        assert json.loads(request["body"]) == {"body": "hello"}
+
+    def test_stale_connection_is_retried(self, client, gitlab_server):
+        def close_after_response(handler):
+            handler.close_connection = True
+            return 200, {}, {"iid": 1}
+
+        gitlab_server.routes[f"{MR_BASE}/1"] = close_after_response
+
+        assert client.get_mr(1) == {"iid": 1}
+        assert client.get_mr(1) == {"iid": 1}
+
+        clients = {request["client"] for request in gitlab_server.requests}
+        assert len(gitlab_server.requests) == 2
+        assert len(clients) == 2
+
+    def test_get_is_resent_after_drop_on_reused_connection(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+        gitlab_server.routes[f"{MR_BASE}/2"] = [None, (200, {}, {"iid": 2})]
+
+        assert client.get_mr(1) == {"iid": 1}
+        assert client.get_mr(2) == {"iid": 2}
+
+        assert [request["target"] for request in gitlab_server.requests] == [
+            f"{MR_BASE}/1",
+            f"{MR_BASE}/2",
+            f"{MR_BASE}/2",
+        ]
+
+    def test_post_is_not_resent_after_drop_on_reused_connection(
+        self, client, gitlab_server
+    ):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+        gitlab_server.routes[f"{MR_BASE}/1/notes"] = [None, (201, {}, {"id": 7})]
+
+        assert client.get_mr(1) == {"iid": 1}
+        with pytest.raises(ConnectionError):
+            client.post_mr_note(1, "hello")
+
+        posts = [r for r in gitlab_server.requests if r["method"] == "POST"]
+        assert len(posts) == 1
+
+    def test_proxy_is_used_when_configured(self, gitlab_server, tmp_path, monkeypatch):
+        for var in PROXY_VARS:
+            monkeypatch.delenv(var, raising=False)
+        monkeypatch.setenv("http_proxy", gitlab_server.url)
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+        config = GitLabConfig(
+            token="secret-token",
+            project="group/project",
+            instance_url="http://gitlab.invalid",
+        )
+        gitlab = GitLabClient(tmp_path, config, default_timeout=5.0)
+
+        assert gitlab.get_mr(1) == {"iid": 1}
+
+        assert (
+            gitlab_server.requests[0]["target"] == f"http://gitlab.invalid{MR_BASE}/1"
+        )
+
+
+class TestErrorMapping:
+    """Tests for how responses map to results and errors."""
+
+    def test_error_status_raises(self, client, gitlab_server):
+        with pytest.raises(Exception, match="GitLab API error 404"):
+            client.get_mr(1)
+
+    def test_no_content_returns_none(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1/approve"] = (204, {}, None)
+
+        assert client.approve_mr(1) is None
+
+    def test_same_host_redirect_is_followed(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (301, {"Location": f"{MR_BASE}/2"}, None)
+        gitlab_server.routes[f"{MR_BASE}/2"] = (200, {}, {"iid": 2})
+
+        assert client.get_mr(1) == {"iid": 2}
+        assert gitlab_server.requests[1]["headers"]["PRIVATE-TOKEN"] == "secret-token"
+
+    def test_foreign_host_redirect_is_not_followed(self, client, gitlab_server):
+        location = f"http://localhost:{gitlab_server.server_address[1]}{MR_BASE}/2"
+        gitlab_server.routes[f"{MR_BASE}/1"] = (302, {"Location": location}, None)
+
+        with pytest.raises(Exception, match="GitLab API error 302"):
+            client.get_mr(1)
+        assert len(gitlab_server.requests) == 1
+
+    def test_post_is_not_redirected_by_302(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1/notes"] = (
+            302,
+            {"Location": f"{MR_BASE}/2/notes"},
+            None,
+        )
+
+        with pytest.raises(Exception, match="GitLab API error 302"):
+            client.post_mr_note(1, "hello")
+        assert len(gitlab_server.requests) == 1
+
+    def test_redirect_loop_raises(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (307, {"Location": f"{MR_BASE}/1"}, None)
+
+        with pytest.raises(Exception, match="GitLab API error 307"):
+            client.get_mr(1)
+        assert len(gitlab_server.requests) == glab_client.MAX_REDIRECTS + 1
+
+
+class TestFetchMRBundle:
+    """Tests for the concurrent MR fetch."""
+
+    def test_results_are_in_order(self, client, gitlab_server):
+        def slow_mr(handler):
+            time.sleep(0.05)
+            return 200, {}, {"iid": 1}
+
+        gitlab_server.routes[f"{MR_BASE}/1"] = slow_mr
+        gitlab_server.routes[f"{MR_BASE}/1/changes"] = (200, {}, {"changes": []})
+        gitlab_server.routes[f"{MR_BASE}/1/commits"] = (200, {}, [{"id": "abc"}])
+
+        mr, changes, commits = client.fetch_mr_bundle(1)
+
+        assert mr == {"iid": 1}
+        assert changes == {"changes": []}
+        assert commits == [{"id": "abc"}]
+
+    def test_endpoint_error_propagates(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+        gitlab_server.routes[f"{MR_BASE}/1/commits"] = (200, {}, [])
+
+        with pytest.raises(Exception, match="GitLab API error 404"):
+            client.fetch_mr_bundle(1)
+
+    def test_worker_threads_do_not_outlive_the_call(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (200, {}, {"iid": 1})
+        gitlab_server.routes[f"{MR_BASE}/1/changes"] = (200, {}, {"changes": []})
+        gitlab_server.routes[f"{MR_BASE}/1/commits"] = (200, {}, [])
+
+        client.fetch_mr_bundle(1)
+
+        workers = [t for t in threading.enumerate() if t.name.startswith("gitlab-api")]
+        assert workers == []
+
+
+class TestPagination:
+    """Tests for following paginated list endpoints."""
+
+    @staticmethod
+    def _pages(next_headers):
+        """Route serving page 1 with next_headers, then a final page 2."""
+
+        def route(handler):
+            query = parse_qs(urlsplit(handler.path).query)
+            if query.get("page") == ["2"] or query.get("cursor") == ["abc"]:
+                return 200, {}, [{"id": "second"}]
+            return 200, next_headers, [{"id": "first"}]
+
+        return route
+
+    def test_follows_link_header(self, client, gitlab_server):
+        link = f'<{gitlab_server.url}{MR_BASE}/1/commits?per_page=100&cursor=abc>; rel="next"'
+        gitlab_server.routes[f"{MR_BASE}/1/commits"] = self._pages({"Link": link})
+
+        assert client.get_mr_commits(1) == [{"id": "first"}, {"id": "second"}]
+        assert parse_qs(urlsplit(gitlab_server.requests[1]["target"]).query) == {
+            "per_page": ["100"],
+            "cursor": ["abc"],
+        }
+
+    def test_follows_next_page_header(self, client, gitlab_server):
+        gitlab_server.routes[f"{MR_BASE}/1/commits"] = self._pages({"x-next-page": "2"})
+
+        assert client.get_mr_commits(1) == [{"id": "first"}, {"id": "second"}]
+        assert len(gitlab_server.requests) == 2
+
+    def test_link_to_foreign_host_stays_on_instance(self, client, gitlab_server):
+        other = _start_server()
+        try:
+            link = f'<{other.url}/steal?cursor=abc>; rel="next"'
+            gitlab_server.routes[f"{MR_BASE}/1/commits"] = self._pages({"Link": link})
+
+            assert client.get_mr_commits(1) == [{"id": "first"}, {"id": "second"}]
+        finally:
+            _stop_server(other)
+
+        assert other.requests == []
+        assert (
+            urlsplit(gitlab_server.requests[1]["target"]).path == f"{MR_BASE}/1/commits"
+        )
+
+
+class TestLoadGitLabConfig:
+    """Tests for the cached config loader."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        glab_client._reset_gitlab_config_cache()
+        yield
+        glab_client._reset_gitlab_config_cache()
+
+    @staticmethod
+    def _write_config(project_dir, data, mtime_ns):
+        config_path = project_dir / ".auto-claude" / "gitlab" / "config.json"
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps(data))
+        os.utime(config_path, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert glab_client.load_gitlab_config(tmp_path) is None
+
+    def test_cache_hit_returns_same_object(self, tmp_path):
+        self._write_config(tmp_path, {"token": "t", "project": "g/p"}, 10**18)
+
+        config = glab_client.load_gitlab_config(tmp_path)
+
+        assert config == GitLabConfig(
+            token="t", project="g/p", instance_url="https://gitlab.com"
+        )
+        assert glab_client.load_gitlab_config(tmp_path) is config
+
+    def test_rewritten_file_is_reloaded(self, tmp_path):
+        self._write_config(tmp_path, {"token": "t", "project": "g/p"}, 10**18)
+        assert glab_client.load_gitlab_config(tmp_path).project == "g/p"
+
+        self._write_config(tmp_path, {"token": "t", "project": "g/q"}, 10**18 + 1)
+
+        assert glab_client.load_gitlab_config(tmp_path).project == "g/q"
+
+    def test_incomplete_config_returns_none(self, tmp_path):
+        self._write_config(tmp_path, {"project": "g/p"}, 10**18)
+
+        assert glab_client.load_gitlab_config(tmp_path) is None
+
+
+class TestRetries:
+    """Tests for retrying transient failures."""
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(glab_client.time, "sleep", delays.append)
+        return delays
+
+    def test_get_is_retried_until_exhausted(self, client, gitlab_server, sleeps):
+        gitlab_server.routes[f"{MR_BASE}/1"] = (503, {}, {"message": "unavailable"})
+
+        with pytest.raises(Exception, match="GitLab API error 503"):
+            client.get_mr(1)
+
+        assert len(gitlab_server.requests) == glab_client.MAX_RETRIES + 1
+        assert sleeps == [
+            glab_client.RETRY_BACKOFF * 2**attempt
+            for attempt in range(glab_client.MAX_RETRIES)
+        ]
+
+    def test_get_succeeds_after_transient_error(self, client, gitlab_server, sleeps):
+        gitlab_server.routes[f"{MR_BASE}/1"] = [
+            (502, {}, {"message": "bad gateway"}),
+            (200, {}, {"iid": 1}),
+        ]
+
+        assert client.get_mr(1) == {"iid": 1}
+        assert len(gitlab_server.requests) == 2
+
+    def test_retry_after_is_honoured_and_capped(self, client, gitlab_server, sleeps):
+        gitlab_server.routes[f"{MR_BASE}/1"] = [
+            (429, {"Retry-After": "2"}, {"message": "slow down"}),
+            (429, {"Retry-After": "3600"}, {"message": "slow down"}),
+            (200, {}, {"iid": 1}),
+        ]
+
+        assert client.get_mr(1) == {"iid": 1}
+        assert sleeps == [2.0, glab_client.MAX_RETRY_AFTER]
+
+    @pytest.mark.parametrize("status", [500, 502, 503, 504])
+    def test_post_is_not_retried_on_server_error(
+        self, client, gitlab_server, sleeps, status
+    ):
+        gitlab_server.routes[f"{MR_BASE}/1/notes"] = (status, {}, {"message": "error"})
+
+        with pytest.raises(Exception, match=f"GitLab API error {status}"):
+            client.post_mr_note(1, "hello")
+        assert len(gitlab_server.requests) == 1
+
+    def test_merge_is_not_retried_on_server_error(self, client, gitlab_server, sleeps):
+        gitlab_server.routes[f"{MR_BASE}/1/merge"] = (502, {}, {"message": "error"})
+
+        with pytest.raises(Exception, match="GitLab API error 502"):
+            client.merge_mr(1)
+        assert len(gitlab_server.requests) == 1
+
+    def test_post_is_retried_on_rate_limit(self, client, gitlab_server, sleeps):
+        gitlab_server.routes[f"{MR_BASE}/1/notes"] = [
+            (429, {}, {"message": "slow down"}),
+            (201, {}, {"id": 7}),
+        ]
+
+        assert client.post_mr_note(1, "hello") == {"id": 7}
+        assert len(gitlab_server.requests) == 2
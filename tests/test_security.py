@@ -10,8 +10,13 @@ Tests the security.py module functionality including:
 - Security hook behavior
 """
 
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
+import security
 from security import (
     extract_commands,
     split_command_segments,
@@ -688,3 +693,33 @@ class TestMysqladminValidator:
         """Blocks kill."""
         allowed, reason = validate_mysqladmin_command("mysqladmin kill 123")
         assert allowed is False
+
+
+class TestLazyPackageExports:
+    """Tests for the lazily resolved security package exports."""
+
+    def test_submodule_import_skips_package_exports(self):
+        """Importing one validator module does not load project_analyzer."""
+        backend = Path(__file__).resolve().parent.parent / "apps" / "backend"
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, security.network_validators; "
+                "print('project_analyzer' in sys.modules)",
+            ],
+            cwd=backend,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == "False"
+
+    def test_exports_resolve(self):
+        """Every name in __all__ resolves on first access."""
+        for name in security.__all__:
+            assert getattr(security, name) is not None
+
+    def test_unknown_attribute_raises(self):
+        """Names outside the export list raise AttributeError."""
+        assert not hasattr(security, "not_an_export")